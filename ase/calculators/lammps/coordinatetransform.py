@@ -1,8 +1,11 @@
 import numpy as np
 from ase.geometry import wrap_positions
 
-# Order in which off-diagonal elements are checked for strong tilt
-FLIP_ORDER = [(1, 0, 0), (2, 0, 0), (2, 1, 1)]
+# Order in which off-diagonal elements are checked for strong tilt.
+# (i, j, k): element [i][j] is reduced by subtracting cell vector k
+# from cell vector i.  yz is reduced before xz, because subtracting
+# the second cell vector from the third one also changes xz.
+FLIP_ORDER = [(1, 0, 0), (2, 1, 1), (2, 0, 0)]
 
 
 class Prism:
@@ -75,19 +78,14 @@ class Prism:
         #     \         /--/                   \         /--/
         #      \    /--/                        \    /--/
         #       o==/-----------------------------o--/
-        # !TODO: handle extreme tilt (= off-diagonal > 1.5)
-        self.flip = np.array(
-            [
-                abs(self.lammps_cell[i][j] / self.lammps_tilt[k][k]) > 0.5
-                and self.pbc[k]
-                for i, j, k in FLIP_ORDER
-            ]
-        )
+        # 'flip' holds the (integer) number of times cell vector k was
+        # subtracted from cell vector i, which also handles extreme tilts.
+        self.flip = np.zeros(len(FLIP_ORDER), int)
         for iteri, (i, j, k) in enumerate(FLIP_ORDER):
-            if self.flip[iteri]:
-                change = self.lammps_cell[k][k]
-                change *= np.sign(self.lammps_cell[i][j])
-                self.lammps_cell[i][j] -= change
+            if self.pbc[k]:
+                self.flip[iteri] = np.round(self.lammps_cell[i][j] /
+                                            self.lammps_cell[k][k])
+                self.lammps_cell[i] -= self.flip[iteri] * self.lammps_cell[k]
 
     def get_lammps_prism(self):
         """Return into lammps coordination system rotated cell
@@ -111,11 +109,8 @@ class Prism:
         self.lammps_tilt = self.lammps_cell.copy()
 
         # reverse flip
-        for iteri, (i, j, k) in enumerate(FLIP_ORDER):
-            if self.flip[iteri]:
-                change = self.lammps_cell[k][k]
-                change *= np.sign(self.lammps_cell[i][j])
-                self.lammps_tilt[i][j] -= change
+        for iteri, (i, j, k) in reversed(list(enumerate(FLIP_ORDER))):
+            self.lammps_tilt[i] += self.flip[iteri] * self.lammps_tilt[k]
 
         # try to detect potential flips in lammps
         # (lammps minimizes the cell-vector lengths)
@@ -5,7 +5,6 @@ from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterable, Iterator
 
-import ase.io
 from ase.db import connect
 from ase.db.core import convert_str_to_int_float_or_str
 from ase.db.row import row2dct
@@ -123,7 +122,8 @@ class CLICommand:
 
 def count_keys(db, query):
     keys = defaultdict(int)
-    for row in db.select(query):
+    for row in db.select(query, include_data=False,
+                         columns=['key_value_pairs']):
         for key in row._keys:
             keys[key] += 1
 
@@ -173,7 +173,8 @@ def main(args):
         keys = args.show_values.split(',')
         values = {key: defaultdict(int) for key in keys}
         numbers = set()
-        for row in db.select(query):
+        for row in db.select(query, include_data=False,
+                             columns=['key_value_pairs']):
             kvp = row.key_value_pairs
             for key in keys:
                 value = kvp.get(key)
@@ -196,8 +197,9 @@ def main(args):
         return
 
     if args.add_from_file:
+        from ase.io import read
         filename = args.add_from_file
-        configs = ase.io.read(filename)
+        configs = read(filename)
         if not isinstance(configs, list):
             configs = [configs]
         for atoms in configs:
@@ -274,24 +276,18 @@ def main(args):
         return
 
     if add_key_value_pairs or delete_keys:
-        ids = [row['id'] for row in db.select(query)]
-        M = 0
-        N = 0
-        with db:
-            for id in ids:
-                m, n = db.update(id, delete_keys=delete_keys,
-                                 **add_key_value_pairs)
-                M += m
-                N += n
+        nrows, M, N = db.update_where(query, delete_keys=delete_keys,
+                                      **add_key_value_pairs)
         out('Added %s (%s updated)' %
             (plural(M, 'key-value pair'),
-             plural(len(add_key_value_pairs) * len(ids) - M, 'pair')))
+             plural(len(add_key_value_pairs) * nrows - M, 'pair')))
         out('Removed', plural(N, 'key-value pair'))
 
         return
 
     if args.delete:
-        ids = [row['id'] for row in db.select(query, include_data=False)]
+        ids = [row['id'] for row in db.select(query, include_data=False,
+                                              columns=['id'])]
         if ids and not args.yes:
             msg = 'Delete %s? (yes/No): ' % plural(len(ids), 'row')
             if input(msg).lower() != 'yes':
@@ -418,11 +414,10 @@ def row2str(row) -> str:
 
     width0 = max(max(len(row[0]) for row in t['table']), 3)
     width1 = max(max(len(row[1]) for row in t['table']), 11)
-    S.append('{:{}} | {:{}} | Value'
-             .format('Key', width0, 'Description', width1))
+    fmt = '{:%d} | {:%d} | {}' % (width0, width1)
+    S.append(fmt.format('Key', 'Description', 'Value'))
     for key, desc, value in t['table']:
-        S.append('{:{}} | {:{}} | {}'
-                 .format(key, width0, desc, width1, value))
+        S.append(fmt.format(key, desc, value))
     return '\n'.join(S)
 
 
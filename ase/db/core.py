@@ -216,15 +216,18 @@ def convert_str_to_int_float_or_str(value):
         return value
 
 
-def parse_selection(selection, **kwargs):
-    if selection is None or selection == '':
-        expressions = []
-    elif isinstance(selection, int):
-        expressions = [('id', '=', selection)]
-    elif isinstance(selection, list):
-        expressions = selection
-    else:
-        expressions = [w.strip() for w in selection.split(',')]
+@functools.lru_cache(maxsize=128)
+def parse_selection_string(selection):
+    """Cached version of parse_expressions() for selection strings.
+
+    Returns tuples so that the cached result can not be modified."""
+    keys, comparisons = parse_expressions(
+        [w.strip() for w in selection.split(',')])
+    return tuple(keys), tuple(comparisons)
+
+
+def parse_expressions(expressions):
+    """Split expressions into keys and (key, op, value) comparisons."""
     keys = []
     comparisons = []
     for expression in expressions:
@@ -257,6 +260,22 @@ def parse_selection(selection, **kwargs):
             continue
         key, value = expression.split(op)
         comparisons.append((key, op, value))
+    return keys, comparisons
+
+
+def parse_selection(selection, **kwargs):
+    if selection is None or selection == '':
+        keys = []
+        comparisons = []
+    elif isinstance(selection, int):
+        keys = []
+        comparisons = [('id', '=', selection)]
+    elif isinstance(selection, list):
+        keys, comparisons = parse_expressions(selection)
+    else:
+        keys, comparisons = parse_selection_string(selection)
+        keys = list(keys)
+        comparisons = list(comparisons)
 
     cmps = []
     for key, value in kwargs.items():
@@ -495,7 +514,7 @@ class Database:
         len(db) to count all rows.
         """
         n = 0
-        for row in self.select(selection, **kwargs):
+        for row in self.select(selection, include_data=False, **kwargs):
             n += 1
         return n
 
@@ -569,6 +588,30 @@ class Database:
             self._update(row.id, kvp, data)
         return m, n
 
+    def update_where(self, selection=None, delete_keys=[],
+                     **add_key_value_pairs):
+        """Update and/or delete key-value pairs of all selected rows.
+
+        selection: int, str or list
+            See the select() method.
+        delete_keys: list of str
+            Keys to remove.
+
+        Use keyword arguments to add new key-value pairs.
+
+        Returns number of rows updated and number of key-value pairs
+        added and removed.
+        """
+        ids = [row.id for row in self.select(selection, include_data=False)]
+        M = 0
+        N = 0
+        for id in ids:
+            m, n = self.update(id, delete_keys=delete_keys,
+                               **add_key_value_pairs)
+            M += m
+            N += n
+        return len(ids), M, N
+
     def delete(self, ids):
         """Delete rows."""
         raise NotImplementedError
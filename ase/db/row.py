@@ -253,6 +253,10 @@ class AtomsRow:
         return atoms
 
 
+# Keys always included in the table made by row2dct():
+row2dct_keys = frozenset(['id', 'energy', 'fmax', 'smax', 'mass', 'age'])
+
+
 def row2dct(row,
             key_descriptions: Dict[str, Tuple[str, str, str]] = {}
             ) -> Dict[str, Any]:
@@ -291,9 +295,9 @@ def row2dct(row,
         dct['constraints'] = ', '.join(c.__class__.__name__
                                        for c in constraints)
 
-    keys = ({'id', 'energy', 'fmax', 'smax', 'mass', 'age'} |
-            set(key_descriptions) |
-            set(row.key_value_pairs))
+    keys = set(row2dct_keys)
+    keys.update(key_descriptions)
+    keys.update(row.key_value_pairs)
     dct['table'] = []
     for key in keys:
         if key == 'age':
@@ -28,7 +28,7 @@ from ase.data import atomic_numbers
 from ase.calculators.calculator import all_properties
 from ase.db.row import AtomsRow
 from ase.db.core import (Database, ops, now, lock, invop, parse_selection,
-                         object_to_bytes, bytes_to_object)
+                         check, object_to_bytes, bytes_to_object)
 from ase.parallel import parallel_function
 
 VERSION = 9
@@ -353,21 +353,7 @@ class SQLite3Database(Database):
                 cur.executemany('INSERT INTO species VALUES (?, ?, ?)',
                                 species)
 
-            text_key_values = []
-            number_key_values = []
-            for key, value in key_value_pairs.items():
-                if isinstance(value, (numbers.Real, np.bool_)):
-                    number_key_values.append([key, float(value), id])
-                else:
-                    assert isinstance(value, str)
-                    text_key_values.append([key, value, id])
-
-            cur.executemany('INSERT INTO text_key_values VALUES (?, ?, ?)',
-                            text_key_values)
-            cur.executemany('INSERT INTO number_key_values VALUES (?, ?, ?)',
-                            number_key_values)
-            cur.executemany('INSERT INTO keys VALUES (?, ?)',
-                            [(key, id) for key in key_value_pairs])
+            self._insert_key_value_pairs(cur, [(id, key_value_pairs)])
 
             # Insert entries in the valid tables
             for tabname in ext_tables.keys():
@@ -378,6 +364,27 @@ class SQLite3Database(Database):
 
         return id
 
+    def _insert_key_value_pairs(self, cur, kvps):
+        """Fill the keys, text_key_values and number_key_values tables
+        from a list of (id, key_value_pairs) tuples."""
+        text_key_values = []
+        number_key_values = []
+        keys = []
+        for id, key_value_pairs in kvps:
+            for key, value in key_value_pairs.items():
+                if isinstance(value, (numbers.Real, np.bool_)):
+                    number_key_values.append([key, float(value), id])
+                else:
+                    assert isinstance(value, str)
+                    text_key_values.append([key, value, id])
+                keys.append((key, id))
+
+        cur.executemany('INSERT INTO text_key_values VALUES (?, ?, ?)',
+                        text_key_values)
+        cur.executemany('INSERT INTO number_key_values VALUES (?, ?, ?)',
+                        number_key_values)
+        cur.executemany('INSERT INTO keys VALUES (?, ?)', keys)
+
     def _update(self, id, key_value_pairs, data=None):
         """Update key_value_pairs and data for a single row """
         encode = self.encode
@@ -401,21 +408,7 @@ class SQLite3Database(Database):
             self._delete(cur, [id], ['keys', 'text_key_values',
                                      'number_key_values'])
 
-            text_key_values = []
-            number_key_values = []
-            for key, value in key_value_pairs.items():
-                if isinstance(value, (numbers.Real, np.bool_)):
-                    number_key_values.append([key, float(value), id])
-                else:
-                    assert isinstance(value, str)
-                    text_key_values.append([key, value, id])
-
-            cur.executemany('INSERT INTO text_key_values VALUES (?, ?, ?)',
-                            text_key_values)
-            cur.executemany('INSERT INTO number_key_values VALUES (?, ?, ?)',
-                            number_key_values)
-            cur.executemany('INSERT INTO keys VALUES (?, ?)',
-                            [(key, id) for key in key_value_pairs])
+            self._insert_key_value_pairs(cur, [(id, key_value_pairs)])
 
             # Insert entries in the valid tables
             for tabname in ext_tables.keys():
@@ -426,6 +419,52 @@ class SQLite3Database(Database):
 
         return id
 
+    @parallel_function
+    @lock
+    def update_where(self, selection=None, delete_keys=[],
+                     **add_key_value_pairs):
+        check(add_key_value_pairs)
+        keys, cmps = parse_selection(selection)
+        sql, args = self.create_select_statement(
+            keys, cmps, what='systems.id, systems.key_value_pairs')
+
+        mtime = now()
+        M = 0
+        N = 0
+        with self.managed_connection() as con:
+            cur = con.cursor()
+            cur.execute(sql, args)
+            rows = cur.fetchall()
+            if not rows:
+                return 0, 0, 0
+
+            ids = []
+            kvps = []
+            for id, kvp in rows:
+                kvp = self.decode(kvp)
+                n = len(kvp)
+                for key in delete_keys:
+                    kvp.pop(key, None)
+                n -= len(kvp)
+                m = -len(kvp)
+                kvp.update(add_key_value_pairs)
+                m += len(kvp)
+                M += m
+                N += n
+
+                ids.append(id)
+                kvps.append((id, kvp))
+                # (Not executemany(): PostgreSQL's only handles INSERTs.)
+                cur.execute(
+                    'UPDATE systems SET mtime=?, key_value_pairs=? WHERE id=?',
+                    (mtime, self.encode(kvp), id))
+
+            self._delete(cur, ids, ['keys', 'text_key_values',
+                                    'number_key_values'])
+            self._insert_key_value_pairs(cur, kvps)
+
+        return len(ids), M, N
+
     def get_last_id(self, cur):
         cur.execute('SELECT seq FROM sqlite_sequence WHERE name="systems"')
         result = cur.fetchone()
@@ -618,8 +657,13 @@ class SQLite3Database(Database):
             sql += '\n  WHERE\n  ' + ' AND\n  '.join(where)
         if sort:
             # XXX use "?" instead of "{}"
-            sql += '\nORDER BY {0}.{1} IS NULL, {0}.{1} {2}'.format(
-                sort_table, sort, order)
+            if sort_table == 'systems' and sort == 'id':
+                # id is never NULL, so the rows can be read in
+                # primary-key order without sorting them first:
+                sql += '\nORDER BY systems.id {}'.format(order)
+            else:
+                sql += '\nORDER BY {0}.{1} IS NULL, {0}.{1} {2}'.format(
+                    sort_table, sort, order)
 
         return sql, args
 
@@ -693,6 +737,10 @@ class SQLite3Database(Database):
                     yield {'explain': row}
             else:
                 n = 0
+                # The LIMIT is applied by the database.  Fetch everything
+                # in one go so that the statement is finished and does not
+                # lock the database while the caller loops over the rows
+                # (and maybe writes to the database):
                 for shortvalues in cur.fetchall():
                     values[columnindex] = shortvalues
                     yield self._convert_tuple_to_row(tuple(values))
@@ -1,10 +1,12 @@
 """Various utility methods used troughout the GA."""
 import os
+import math
 import time
 import itertools
 import numpy as np
 from scipy.spatial.distance import cdist
 from ase.io import write, read
+from ase.geometry import find_mic
 from ase.geometry.cell import cell_to_cellpar
 from ase.geometry.rdf import get_rdf
 from ase.data import covalent_radii
@@ -97,16 +99,20 @@ def get_trajectory(fname):
 def gather_atoms_by_tag(atoms):
     """Translates same-tag atoms so that they lie 'together',
     with distance vectors as in the minimum image convention."""
-    tags = atoms.get_tags()
     pos = atoms.get_positions()
+    gather_positions_by_tag(pos, atoms.get_tags(), atoms.cell, atoms.pbc)
+    atoms.set_positions(pos)
+
+
+def gather_positions_by_tag(pos, tags, cell, pbc):
+    """Same as gather_atoms_by_tag(), but modifies the
+    positions array in place and ignores any constraints."""
     for tag in list(set(tags)):
         indices = np.where(tags == tag)[0]
         if len(indices) == 1:
             continue
-        vectors = atoms.get_distances(indices[0], indices[1:],
-                                      mic=True, vector=True)
+        vectors, _ = find_mic(pos[indices[1:]] - pos[indices[0]], cell, pbc)
         pos[indices[1:]] = pos[indices[0]] + vectors
-    atoms.set_positions(pos)
 
 
 def atoms_too_close(atoms, bl, use_tags=False):
@@ -115,26 +121,39 @@ def atoms_too_close(atoms, bl, use_tags=False):
 
     use_tags: whether to use the Atoms tags to disable distance
         checking within a set of atoms with the same tag.
-
-    Note: if certain atoms are constrained and use_tags is True,
-    this method may return unexpected results in case the
-    contraints prevent same-tag atoms to be gathered together in
-    the minimum-image-convention. In such cases, one should
-    (1) release the relevant constraints,
-    (2) apply the gather_atoms_by_tag function, and
-    (3) re-apply the constraints, before using the
-        atoms_too_close function.
+        Same-tag atoms are first gathered together in the
+        minimum-image-convention (ignoring any constraints).
     """
-    a = atoms.copy()
+    pbc = atoms.pbc
+    cell = atoms.cell
+    num = atoms.numbers
     if use_tags:
-        gather_atoms_by_tag(a)
-
-    pbc = a.get_pbc()
-    cell = a.get_cell()
-    num = a.get_atomic_numbers()
-    pos = a.get_positions()
-    tags = a.get_tags()
-    unique_types = sorted(list(set(num)))
+        tags = atoms.get_tags()
+        pos = atoms.positions.copy()
+        gather_positions_by_tag(pos, tags, cell, pbc)
+    else:
+        tags = None
+        pos = atoms.positions
+
+    # Matrix with the minimal allowed distance between each pair of atoms
+    unique_types, inv = np.unique(num, return_inverse=True)
+    bl_dense = np.empty((len(unique_types), len(unique_types)))
+    for i, type1 in enumerate(unique_types):
+        for j, type2 in enumerate(unique_types[i:], start=i):
+            bl_dense[i, j] = bl_dense[j, i] = bl[(type1, type2)]
+    bl_mat = bl_dense[inv[:, None], inv[None, :]]**2
+
+    # Compare squared distances (saves taking the square roots).
+    # Clashes are most likely within the original image, so check
+    # that first.  Ignore the distance of each atom to itself (or to
+    # atoms with the same tag):
+    distances = cdist(pos, pos, 'sqeuclidean')
+    if use_tags:
+        distances[tags[:, None] == tags[None, :]] = np.inf
+    else:
+        np.fill_diagonal(distances, np.inf)
+    if (distances < bl_mat).any():
+        return True
 
     neighbours = []
     for i in range(3):
@@ -143,26 +162,16 @@ def atoms_too_close(atoms, bl, use_tags=False):
         else:
             neighbours.append([0])
 
-    for nx, ny, nz in itertools.product(*neighbours):
-        displacement = np.dot(cell.T, np.array([nx, ny, nz]).T)
-        pos_new = pos + displacement
-        distances = cdist(pos, pos_new)
-
-        if nx == 0 and ny == 0 and nz == 0:
-            if use_tags and len(a) > 1:
-                x = np.array([tags]).T
-                distances += 1e2 * (cdist(x, x) == 0)
-            else:
-                distances += 1e2 * np.identity(len(a))
-
-        iterator = itertools.combinations_with_replacement(unique_types, 2)
-        for type1, type2 in iterator:
-            x1 = np.where(num == type1)
-            x2 = np.where(num == type2)
-            if np.min(distances[x1].T[x2]) < bl[(type1, type2)]:
-                return True
-
-    return False
+    # All other neighbouring images in one go:
+    offsets = [offset for offset in itertools.product(*neighbours)
+               if offset != (0, 0, 0)]
+    if not offsets:
+        return False
+    displacements = np.dot(offsets, cell)
+    pos_new = (pos[None, :, :] + displacements[:, None, :]).reshape(-1, 3)
+    distances = cdist(pos, pos_new, 'sqeuclidean')
+    distances = distances.reshape(len(pos), len(offsets), len(pos))
+    return bool((distances < bl_mat[:, None, :]).any())
 
 
 def atoms_too_close_two_sets(a, b, bl):
@@ -180,7 +189,15 @@ def atoms_too_close_two_sets(a, b, bl):
 
     num_a = a.get_atomic_numbers()
     num_b = b.get_atomic_numbers()
-    unique_types = sorted(set(list(num_a) + list(num_b)))
+
+    # Matrix with the minimal allowed distance between atoms in a and b
+    unique_a, inv_a = np.unique(num_a, return_inverse=True)
+    unique_b, inv_b = np.unique(num_b, return_inverse=True)
+    bl_dense = np.empty((len(unique_a), len(unique_b)))
+    for i, type1 in enumerate(unique_a):
+        for j, type2 in enumerate(unique_b):
+            bl_dense[i, j] = bl[(type1, type2)]
+    bl_mat = bl_dense[inv_a[:, None], inv_b[None, :]]**2
 
     neighbours = []
     for i in range(3):
@@ -189,19 +206,9 @@ def atoms_too_close_two_sets(a, b, bl):
     for nx, ny, nz in itertools.product(*neighbours):
         displacement = np.dot(cell_a.T, np.array([nx, ny, nz]).T)
         pos_b_disp = pos_b + displacement
-        distances = cdist(pos_a, pos_b_disp)
-
-        for type1 in unique_types:
-            if type1 not in num_a:
-                continue
-            x1 = np.where(num_a == type1)
-
-            for type2 in unique_types:
-                if type2 not in num_b:
-                    continue
-                x2 = np.where(num_b == type2)
-                if np.min(distances[x1].T[x2]) < bl[(type1, type2)]:
-                    return True
+        distances = cdist(pos_a, pos_b_disp, 'sqeuclidean')
+        if (distances < bl_mat).any():
+            return True
     return False
 
 
@@ -500,15 +507,14 @@ def get_cell_angles_lengths(cell):
     parnames = ['a', 'b', 'c', 'alpha', 'beta', 'gamma']
     values = {n: p for n, p in zip(parnames, cellpar)}
 
+    cell = np.asarray(cell)
     volume = abs(np.linalg.det(cell))
-    for i, param in enumerate(['phi', 'chi', 'psi']):
-        ab = np.linalg.norm(
-            np.cross(cell[(i + 1) % 3, :], cell[(i + 2) % 3, :]))
-        c = np.linalg.norm(cell[i, :])
-        s = np.abs(volume / (ab * c))
-        if 1 + 1e-6 > s > 1:
-            s = 1.
-        values[param] = np.arcsin(s)
+    ab = np.linalg.norm(np.cross(cell[[1, 2, 0]], cell[[2, 0, 1]]), axis=1)
+    c = np.linalg.norm(cell, axis=1)
+    s = np.abs(volume / (ab * c))
+    s[(s > 1) & (s < 1 + 1e-6)] = 1.
+    for param, angle in zip(['phi', 'chi', 'psi'], np.arcsin(s)):
+        values[param] = angle
 
     return values
 
@@ -557,28 +563,33 @@ class CellBounds:
                 bound = [b * np.pi / 180. for b in bound]
             self.bounds[param] = bound
 
+        # Lower and upper bounds as arrays in a fixed parameter order:
+        self.order = ('a', 'b', 'c', 'alpha', 'beta', 'gamma',
+                      'phi', 'chi', 'psi')
+        self.lo = np.array([self.bounds[param][0] for param in self.order])
+        self.hi = np.array([self.bounds[param][1] for param in self.order])
+
     def is_within_bounds(self, cell):
         values = get_cell_angles_lengths(cell)
-        verdict = True
-        for param, bound in self.bounds.items():
-            if not (bound[0] <= values[param] <= bound[1]):
-                verdict = False
-        return verdict
+        vals = np.array([values[param] for param in self.order])
+        return bool(((vals >= self.lo) & (vals <= self.hi)).all())
 
 
 def get_rotation_matrix(u, t):
     """Returns the transformation matrix for rotation over
     an angle t along an axis with direction u.
     """
-    ux, uy, uz = u
-    cost, sint = np.cos(t), np.sin(t)
-    rotmat = np.array([[(ux**2) * (1 - cost) + cost,
-                        ux * uy * (1 - cost) - uz * sint,
-                        ux * uz * (1 - cost) + uy * sint],
-                       [ux * uy * (1 - cost) + uz * sint,
-                        (uy**2) * (1 - cost) + cost,
-                        uy * uz * (1 - cost) - ux * sint],
-                       [ux * uz * (1 - cost) - uy * sint,
-                        uy * uz * (1 - cost) + ux * sint,
-                        (uz**2) * (1 - cost) + cost]])
+    # Plain Python floats are much faster than NumPy scalars here
+    ux, uy, uz = np.asarray(u, dtype=float).tolist()
+    cost, sint = math.cos(t), math.sin(t)
+    omc = 1 - cost
+    rotmat = np.array([[ux * ux * omc + cost,
+                        ux * uy * omc - uz * sint,
+                        ux * uz * omc + uy * sint],
+                       [ux * uy * omc + uz * sint,
+                        uy * uy * omc + cost,
+                        uy * uz * omc - ux * sint],
+                       [ux * uz * omc - uy * sint,
+                        uy * uz * omc + ux * sint,
+                        uz * uz * omc + cost]])
     return rotmat
@@ -1,3 +1,5 @@
+import time
+
 import numpy as np
 
 import ase.gui.ui as ui
@@ -71,8 +73,16 @@ class Movie:
 
     def play(self):
         self.stop()
-        t = 1 / self.time.value
-        self.timer = self.gui.window.after(t, self.step)
+        self.next_time = time.monotonic()
+        self.schedule()
+
+    def schedule(self):
+        # Schedule the next frame relative to when the previous one was
+        # due, so that the time spent drawing does not lower the frame rate:
+        now = time.monotonic()
+        self.next_time = max(self.next_time + 1 / self.time.value, now)
+        self.timer = self.gui.window.after(max(self.next_time - now, 0.001),
+                                           self.step)
 
     def stop(self):
         if self.timer is not None:
@@ -93,4 +103,4 @@ class Movie:
             i = (i + self.direction * delta + nimages) % nimages
 
         self.frame_number.value = i + 1
-        self.play()
+        self.schedule()
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from ase.calculators.lammps import Prism
+
+
+@pytest.mark.parametrize('tilt', [0.3, 0.7, 1.6, -2.4])
+def test_prism_reduced_tilt(tilt):
+    cell = np.array([[2.0, 0.0, 0.0],
+                     [tilt * 2.0, 3.0, 0.0],
+                     [-tilt * 2.0, tilt * 3.0, 4.0]])
+    p = Prism(cell)
+    lammps_cell = p.lammps_cell
+    xx, yy = lammps_cell[0, 0], lammps_cell[1, 1]
+    assert abs(lammps_cell[1, 0]) <= 0.5 * xx + 1e-10
+    assert abs(lammps_cell[2, 0]) <= 0.5 * xx + 1e-10
+    assert abs(lammps_cell[2, 1]) <= 0.5 * yy + 1e-10
+
+    # The reduced cell must describe the same lattice:
+    tilted = np.dot(cell, p.rot_mat)
+    transform = np.linalg.solve(tilted.T, lammps_cell.T).T
+    assert np.allclose(transform, np.round(transform))
+    assert np.isclose(abs(np.linalg.det(transform)), 1.0)
+
+    assert np.allclose(p.update_cell(lammps_cell.copy()), cell)
@@ -42,3 +42,24 @@ def test_db(name, testdir):
         for id in range(2, 2 + N):
             db.update(id, z=3)
     print(time() - t0)
+
+
+@pytest.mark.parametrize('name', ['x.json', 'x.db'])
+def test_update_where(name, testdir):
+    db = ase.db.connect(name, append=False)
+    db.write(Atoms(), x=1, data={'a': 1})
+    db.write(Atoms('H'), x=2)
+    db.write(Atoms('H2'), y='abc')
+
+    nrows, m, n = db.update_where('x', z=3, delete_keys=['x'])
+    assert (nrows, m, n) == (2, 2, 2)
+    assert db.count('z=3') == 2
+    assert db.count('x') == 0
+    assert db.get(1).data == {'a': 1}
+
+    nrows, m, n = db.update_where('H>1', y='def')
+    assert (nrows, m, n) == (1, 0, 0)
+    assert db.get(3).y == 'def'
+    assert db.count('y=abc') == 0
+
+    assert db.update_where('z=4', w=1) == (0, 0, 0)
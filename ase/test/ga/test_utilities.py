@@ -0,0 +1,15 @@
+import pytest
+
+from ase import Atoms
+from ase.ga.utilities import atoms_too_close_two_sets
+
+
+def test_atoms_too_close_two_sets_bl_keys():
+    a = Atoms('H', positions=[[0, 0, 0]])
+    b = Atoms('O', positions=[[0.01, 0, 0]])
+    # Missing pairs are an error, not a zero distance:
+    with pytest.raises(KeyError):
+        atoms_too_close_two_sets(a, b, {(1, 1): 0.5, (8, 8): 0.5})
+    # Only the (type in a, type in b) key is used:
+    assert atoms_too_close_two_sets(a, b, {(1, 8): 0.5, (8, 1): 0.001})
+    assert not atoms_too_close_two_sets(a, b, {(1, 8): 0.001, (8, 1): 0.5})
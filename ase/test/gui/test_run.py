@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
@@ -7,11 +8,6 @@ import numpy as np
 from ase import Atoms
 from ase.calculators.singlepoint import SinglePointCalculator
 from ase.build import molecule, bulk
-import ase.gui.ui as ui
-from ase.gui.i18n import _
-from ase.gui.gui import GUI
-from ase.gui.save import save_dialog
-from ase.gui.quickinfo import info
 
 
 class GUIError(Exception):
@@ -23,20 +19,77 @@ def mock_gui_error(title, text=None):
     raise GUIError(title, text)
 
 
-@pytest.fixture
+@lru_cache()
+def _bulk(symbol, repeat):
+    atoms = bulk(symbol)
+    return atoms * repeat if repeat else atoms
+
+
+@lru_cache()
+def _molecule(name):
+    return molecule(name)
+
+
+def cached_bulk(symbol, repeat=None):
+    # Tests modify their atoms, so always hand out copies
+    return _bulk(symbol, repeat).copy()
+
+
+def cached_molecule(name):
+    return _molecule(name).copy()
+
+
+@pytest.fixture(scope='session')
 def display():
     pytest.importorskip('tkinter')
     if not os.environ.get('DISPLAY'):
         raise pytest.skip('no display')
 
 
+@pytest.fixture(scope='session')
+def ui(display):
+    # Imported here rather than at module level so that collecting the
+    # tests does not need (or pay for) tkinter.
+    import ase.gui.ui as ui
+    return ui
+
+
+@pytest.fixture(scope='session')
+def session_gui(ui):
+    from ase.gui.gui import GUI
+    # Creating the Tk main window dominates the cost of most tests,
+    # so all tests share one window which is reset in between.
+    # Under pytest-xdist every worker process gets its own window.
+    gui = GUI(None)
+    yield gui
+    gui.exit()
+
+
 @pytest.fixture
-def gui(guifactory):
-    return guifactory(None)
+def gui(session_gui):
+    import tkinter as tk
+    gui = session_gui
+    gui.colormode = 'jmol'
+    gui.window['toggle-show-bonds'] = False
+    gui.images.atom_scale = gui.images.config['radii_scale']
+    # new_atoms() keeps the current repetition, so reset it first:
+    gui.images.repeat_images(np.ones(3, int))
+    gui.new_atoms(Atoms())
+    yield gui
+
+    # Close the dialogs the test opened, as exiting its own GUI would.
+    # Destroying the Toplevels bypasses ui.Window.close(), so also drop
+    # the callbacks those dialogs registered on the GUI; otherwise the
+    # next new_atoms() would update destroyed widgets:
+    for child in gui.window.win.winfo_children():
+        if isinstance(child, tk.Toplevel):
+            child.destroy()
+    gui.observers = []
+    gui.vulnerable_windows = []
 
 
 @pytest.fixture(autouse=True)
-def no_blocking_errors_monkeypatch(monkeypatch):
+def no_blocking_errors_monkeypatch(monkeypatch, ui):
     # If there's an unexpected error in one of the tests, we don't
     # want a blocking dialog to lock the whole test suite:
     for name in ['error', 'showerror', 'showwarning', 'showinfo']:
@@ -51,7 +104,8 @@ def no_blocking_errors_monkeypatch(monkeypatch):
 
 
 @pytest.fixture
-def guifactory(display):
+def guifactory(ui):
+    from ase.gui.gui import GUI
     guis = []
 
     def factory(images):
@@ -66,23 +120,23 @@ def guifactory(display):
 
 @pytest.fixture
 def atoms(gui):
-    atoms = bulk('Ti') * (2, 2, 2)
+    atoms = cached_bulk('Ti', (2, 2, 2))
     gui.new_atoms(atoms)
     return atoms
 
 
 @pytest.fixture
 def animation(guifactory):
-    images = [bulk(sym) for sym in ['Cu', 'Ag', 'Au']]
+    images = [cached_bulk(sym) for sym in ['Cu', 'Ag', 'Au']]
     gui = guifactory(images)
     return gui
 
 
-def test_about(gui):
+def test_about(gui, ui):
     ui.about('name', 'version:1.1.1', 'http://webpage.org')
 
 
-def test_helpwindow(gui):
+def test_helpwindow(gui, ui):
     ui.helpwindow('some\n multiline\n text')
 
 
@@ -147,7 +201,7 @@ def test_color(gui):
 
 
 def test_settings(gui):
-    gui.new_atoms(molecule('H2O'))
+    gui.new_atoms(cached_molecule('H2O'))
     s = gui.settings()
     s.scale.value = 1.9
     s.scale_radii()
@@ -155,15 +209,28 @@ def test_settings(gui):
 
 def test_rotate(gui):
     gui.window['toggle-show-bonds'] = True
-    gui.new_atoms(molecule('H2O'))
+    gui.new_atoms(cached_molecule('H2O'))
     gui.rotate_window()
 
 
-def test_open_and_save(gui, testdir):
-    mol = molecule('H2O')
-    for i in range(3):
-        mol.write('h2o.json')
-    gui.open(filename='h2o.json')
+@pytest.fixture(scope='session')
+def h2o_json(tmp_path_factory):
+    path = tmp_path_factory.mktemp('gui') / 'h2o.json'
+    cached_molecule('H2O').write(path)
+    return path
+
+
+@pytest.fixture(scope='session')
+def fracocc_cif(tmp_path_factory):
+    from ase.test.fio.test_cif import content
+    path = tmp_path_factory.mktemp('gui') / 'fracocc.cif'
+    path.write_text(content)
+    return path
+
+
+def test_open_and_save(gui, testdir, h2o_json):
+    from ase.gui.save import save_dialog
+    gui.open(filename=str(h2o_json))
     save_dialog(gui, 'h2o.cif@-1')
 
 
@@ -171,7 +238,8 @@ def test_open_and_save(gui, testdir):
     None, 'output.png', 'output.eps',
     'output.pov', 'output.traj', 'output.traj@0',
 ])
-def test_export_graphics(gui, testdir, with_bulk_ti, monkeypatch, filename):
+def test_export_graphics(gui, ui, testdir, with_bulk_ti, monkeypatch,
+                         filename):
     # Monkeypatch the blocking dialog:
     monkeypatch.setattr(ui.SaveFileDialog, 'go', lambda event: filename)
     gui.save()
@@ -180,15 +248,12 @@ def test_export_graphics(gui, testdir, with_bulk_ti, monkeypatch, filename):
         assert Path(realfilename).is_file()
 
 
-def test_fracocc(gui, testdir):
-    from ase.test.fio.test_cif import content
-    with open('./fracocc.cif', 'w') as fd:
-        fd.write(content)
-    gui.open(filename='fracocc.cif')
+def test_fracocc(gui, fracocc_cif):
+    gui.open(filename=str(fracocc_cif))
 
 
 def test_povray(gui, testdir):
-    mol = molecule('H2O')
+    mol = cached_molecule('H2O')
     gui.new_atoms(mol)  # not gui.set_atoms(mol)
     n = gui.render_window()
     assert n.basename_widget.value == 'H2O'
@@ -211,7 +276,7 @@ def test_povray(gui, testdir):
 
 @pytest.fixture
 def with_bulk_ti(gui):
-    atoms = bulk('Ti') * (2, 2, 2)
+    atoms = cached_bulk('Ti', (2, 2, 2))
     gui.new_atoms(atoms)
 
 
@@ -253,7 +318,7 @@ def test_modify_magmom(gui, modify):
 
 
 def test_repeat(gui):
-    fe = bulk('Fe')
+    fe = cached_bulk('Fe')
     gui.new_atoms(fe)
     repeat = gui.repeat_window()
 
@@ -292,7 +357,7 @@ def test_movie(animation):
 
 def test_reciprocal(gui):
     # XXX should test 1D, 2D, and it should work correctly of course
-    gui.new_atoms(bulk('Au'))
+    gui.new_atoms(cached_bulk('Au'))
     reciprocal = gui.reciprocal()
     reciprocal.terminate()
     exitcode = reciprocal.wait(timeout=5)
@@ -310,16 +375,16 @@ def test_add_atoms(gui):
     dia.combobox.value = 'CH3CH2OH'
     assert len(gui.atoms) == 0
     dia.add()
-    assert str(gui.atoms.symbols) == str(molecule('CH3CH2OH').symbols)
+    assert str(gui.atoms.symbols) == str(cached_molecule('CH3CH2OH').symbols)
 
 
 def test_cell_editor(gui):
-    au = bulk('Au')
+    au = cached_bulk('Au')
     gui.new_atoms(au.copy())
 
     dia = gui.cell_editor()
 
-    ti = bulk('Ti')
+    ti = cached_bulk('Ti')
 
     dia.update(ti.cell, ti.pbc)
     dia.apply_vectors()
@@ -353,14 +418,16 @@ def test_constrain(gui, atoms):
 
 
 def different_dimensionalities():
-    yield molecule('H2O')
+    yield cached_molecule('H2O')
     yield Atoms('X', cell=[1, 0, 0], pbc=[1, 0, 0])
     yield Atoms('X', cell=[1, 1, 0], pbc=[1, 1, 0])
-    yield bulk('Au')
+    yield cached_bulk('Au')
 
 
 @pytest.mark.parametrize('atoms', different_dimensionalities())
 def test_quickinfo(gui, atoms):
+    from ase.gui.i18n import _
+    from ase.gui.quickinfo import info
     gui.new_atoms(atoms)
     # (Note: String can be in any language)
     refstring = _('Single image loaded.')
@@ -374,7 +441,7 @@ def test_quickinfo(gui, atoms):
 
 
 def test_clipboard_copy(gui):
-    atoms = molecule('CH3CH2OH')
+    atoms = cached_molecule('CH3CH2OH')
     gui.new_atoms(atoms)
     gui.select_all()
     assert all(gui.selected_atoms().symbols == atoms.symbols)
@@ -385,7 +452,7 @@ def test_clipboard_copy(gui):
 
 
 def test_clipboard_cut_paste(gui):
-    atoms = molecule('H2O')
+    atoms = cached_molecule('H2O')
     gui.new_atoms(atoms.copy())
     assert len(gui.atoms) == 3
     gui.select_all()
@@ -395,7 +462,7 @@ def test_clipboard_cut_paste(gui):
 
 
 def test_clipboard_paste_onto_empty(gui):
-    atoms = bulk('Ti')
+    atoms = cached_bulk('Ti')
     gui.clipboard.set_atoms(atoms)
     gui.paste_atoms_from_clipboard()
     # (The paste includes cell and pbc when existing atoms are empty)
@@ -403,10 +470,10 @@ def test_clipboard_paste_onto_empty(gui):
 
 
 def test_clipboard_paste_onto_existing(gui):
-    ti = bulk('Ti')
+    ti = cached_bulk('Ti')
     gui.new_atoms(ti.copy())
     assert gui.atoms == ti
-    h2o = molecule('H2O')
+    h2o = cached_molecule('H2O')
     gui.clipboard.set_atoms(h2o)
     gui.paste_atoms_from_clipboard()
     assert gui.atoms == ti + h2o
@@ -423,7 +490,7 @@ def test_clipboard_paste_invalid(gui, text):
         gui.paste_atoms_from_clipboard()
 
 
-def window():
+def window(ui):
 
     def hello(event=None):
         print('hello', event)
@@ -466,6 +533,6 @@ def runcallbacks(win):
     win.close()
 
 
-def test_callbacks(display):
-    win = window()
+def test_callbacks(ui):
+    win = window(ui)
     win.win.after_idle(runcallbacks)
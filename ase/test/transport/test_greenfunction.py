@@ -0,0 +1,11 @@
+import numpy as np
+
+from ase.transport.greenfunction import GreenFunction
+
+
+def test_orthogonal_basis():
+    H = np.array([[0.0, -1.0], [-1.0, 0.5]])
+    gf = GreenFunction(H, eta=0.01)
+    gf_s = GreenFunction(H, S=np.identity(2), eta=0.01)
+    assert np.allclose(gf.retarded(0.2), gf_s.retarded(0.2))
+    assert np.isclose(gf.dos(0.2), gf_s.dos(0.2))
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from ase.transport.calculators import TransportCalculator
+from ase.transport.selfenergy import LeadSelfEnergy
+
+
+@pytest.fixture
+def selfenergy():
+    # Two-site principal layers of a chain with hopping -1
+    h_ii = np.array([[0.0, -1.0], [-1.0, 0.0]])
+    h_ij = np.array([[0.0, 0.0], [-1.0, 0.0]])
+    h_im = np.array([[0.0, 0.0, 0.0], [-0.5, 0.0, 0.0]])
+    one = np.identity(2)
+    return LeadSelfEnergy((h_ii, one), (h_ij, 0 * h_ij),
+                          (h_im, 0 * h_im), eta=0.01)
+
+
+def test_retarded_cache(selfenergy):
+    sigma1 = selfenergy.retarded(0.5)
+    sigma2 = selfenergy.retarded(-0.5)
+    assert selfenergy.retarded(0.5) is sigma1
+    assert not np.allclose(sigma1, sigma2)
+
+    selfenergy.set_bias(0.1)
+    assert not selfenergy.cache
+    assert not np.allclose(selfenergy.retarded(0.5), sigma1)
+
+    selfenergy.cachesize = 1
+    selfenergy.retarded(0.0)
+    assert list(selfenergy.cache) == [(0.0, 0.1)]
+
+
+def test_clear_cache(selfenergy):
+    sigma1 = selfenergy.retarded(0.5).copy()
+    selfenergy.h_im[:] *= 2
+    selfenergy.clear_cache()
+    assert np.allclose(selfenergy.retarded(0.5), 4 * sigma1)
+
+
+def test_sgfinv(selfenergy):
+    z = 0.3 + selfenergy.eta * 1.j
+    v_00 = z * selfenergy.s_ii - selfenergy.h_ii
+    v_11 = v_00.copy()
+    v_10 = z * selfenergy.s_ij - selfenergy.h_ij
+    v_01 = v_10.T.copy()
+    for _ in range(100):
+        a = np.linalg.solve(v_11, v_01)
+        b = np.linalg.solve(v_11, v_10)
+        v_00 -= v_01 @ b
+        v_11 -= v_10 @ a + v_01 @ b
+        v_01 = -v_01 @ a
+        v_10 = -v_10 @ b
+
+    sgfinv = selfenergy.get_sgfinv(0.3)
+    assert sgfinv.flags['F_CONTIGUOUS']
+    assert np.allclose(sgfinv, v_00)
+
+
+def test_precompute_energies(selfenergy):
+    energies = np.linspace(-3, 3, 7)
+    selfenergy.set_bias(0.2)
+    sigma_emm = [selfenergy.retarded(energy).copy() for energy in energies]
+    selfenergy.clear_cache()
+    # With the default cachesize the cache must grow to hold the grid
+    assert selfenergy.cachesize < len(energies)
+    selfenergy.precompute_energies(energies)
+    assert selfenergy.cachesize == len(energies)
+    assert len(selfenergy.cache) == len(energies)
+    for energy, sigma_mm in zip(energies, sigma_emm):
+        assert np.allclose(selfenergy.retarded(energy), sigma_mm)
+
+
+def test_get_lambda(selfenergy):
+    sigma_mm = selfenergy.retarded(0.5)
+    lambda_mm = selfenergy.get_lambda(0.5)
+    assert np.allclose(lambda_mm, 1.j * (sigma_mm - sigma_mm.T.conj()))
+    assert np.allclose(lambda_mm, lambda_mm.T.conj())
+
+
+def test_sweep_cache_size():
+    # An ordinary transmission sweep must not keep every sigma alive
+    h_lead = -np.eye(4, k=1) - np.eye(4, k=-1)
+    h = -np.eye(6, k=1) - np.eye(6, k=-1)
+    tcalc = TransportCalculator(h=h, h1=h_lead, eta=0.02,
+                                energies=np.linspace(-2, 2, 50))
+    tcalc.get_transmission()
+    for selfenergy in tcalc.selfenergies:
+        assert 0 < len(selfenergy.cache) <= LeadSelfEnergy.cachesize
@@ -0,0 +1,12 @@
+import numpy as np
+
+from ase.transport.tools import fermidistribution
+
+
+def test_fermidistribution_zero_temperature():
+    for energy in [-1, 0, 0.5, np.float32(-0.5), np.int64(2)]:
+        assert fermidistribution(energy, 0) == int(energy <= 0)
+    energies = np.array([-1.0, 0.0, 1.0])
+    assert (fermidistribution(energies, 0) == [1, 1, 0]).all()
+    assert np.allclose(fermidistribution(energies, 0.1),
+                       1 / (1 + np.exp(energies / 0.1)))
@@ -353,8 +353,8 @@ class TransportCalculator:
             E = self.energies.copy()
             T_e = self.T_e.copy()
 
-        if not isinstance(bias, (int, float)):
-            bias = bias[np.newaxis]
+        if np.ndim(bias) > 0:
+            bias = np.asarray(bias)[np.newaxis]
             E = E[:, np.newaxis]
             T_e = T_e[:, np.newaxis]
 
@@ -404,6 +404,7 @@ class TransportCalculator:
             for alpha, sigma in enumerate(self.selfenergies):
                 sigma.h_im[:] = np.dot(sigma.h_im, c_mm)
                 sigma.s_im[:] = np.dot(sigma.s_im, c_mm)
+                sigma.clear_cache()
 
         c_mm = np.take(c_mm, bfs, axis=0)
         c_mm = np.take(c_mm, bfs, axis=1)
@@ -421,9 +422,9 @@ class TransportCalculator:
             p['h'][:] = h_pp
             p['s'][:] = s_pp
             for alpha, sigma in enumerate(self.selfenergies):
-                for m in bfs:
-                    sigma.h_im[:, m] = 0.0
-                    sigma.s_im[:, m] = 0.0
+                sigma.h_im[:, bfs] = 0.0
+                sigma.s_im[:, bfs] = 0.0
+                sigma.clear_cache()
         return h_pp, s_pp
 
     def lowdin_rotation(self, apply=False):
@@ -440,6 +441,7 @@ class TransportCalculator:
             for alpha, sigma in enumerate(self.selfenergies):
                 sigma.h_im[:] = np.dot(sigma.h_im, rot_mm)  # rotate L-C coupl.
                 sigma.s_im[:] = np.dot(sigma.s_im, rot_mm)
+                sigma.clear_cache()
 
         return rot_mm
 
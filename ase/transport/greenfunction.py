@@ -23,7 +23,7 @@ class GreenFunction:
 
             if self.S is None:
                 self.Ginv[:] = 0.0
-                self.Ginv.flat[:: len(self.S) + 1] = z
+                np.fill_diagonal(self.Ginv, z)
             else:
                 self.Ginv[:] = z
                 self.Ginv *= self.S
@@ -1,65 +1,228 @@
+from collections import OrderedDict
+
 import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.linalg.blas import zgemm
+
+from ase.transport.tools import dagger
+
+
+def _sancho_rubio(work, conv):
+    """Decimate the semi-infinite lead until the couplings vanish.
+
+    work is a complex Fortran-ordered (n, 8 n) array whose first four
+    n x n column blocks hold v_00, v_11, v_01 and v_10; the other four
+    are scratch space.  Returns the inverse surface Green function, which
+    is the updated v_00 block.
+
+    SciPy only promises that the overwrite flags *may* reuse the given
+    arrays, so the returned arrays are always used; with the Fortran-ordered
+    blocks they are the blocks themselves and nothing is allocated."""
+    n = len(work)
+    v_00, v_11, v_01, v_10 = [work[:, i * n:(i + 1) * n] for i in range(4)]
+    rhs = work[:, 4 * n:6 * n]  # v_01 and v_10 side by side for lu_solve
+    tmp = work[:, 6 * n:7 * n]
+    lu = work[:, 7 * n:]
+    conv_sq = conv**2
+    delta_sq = conv_sq + 1
+    while delta_sq > conv_sq:
+        lu[:] = v_11
+        lu_piv = lu_factor(lu, overwrite_a=True, check_finite=False)
+        rhs[:, :n] = v_01
+        rhs[:, n:] = v_10
+        ab = lu_solve(lu_piv, rhs, overwrite_b=True, check_finite=False)
+        a = ab[:, :n]
+        b = ab[:, n:]
+        tmp = zgemm(1.0, v_01, b, 0.0, tmp, overwrite_c=True)
+        v_00 -= tmp
+        v_11 = zgemm(-1.0, v_10, a, 1.0, v_11, overwrite_c=True)
+        v_11 -= tmp
+        # Write the new couplings to the free blocks and swap roles
+        tmp, v_01 = v_01, zgemm(-1.0, v_01, a, 0.0, tmp, overwrite_c=True)
+        lu, v_10 = v_10, zgemm(-1.0, v_10, b, 0.0, lu, overwrite_c=True)
+        # Squared Frobenius norm; bounds the largest element from above
+        v_01_flat = v_01.ravel(order='K')  # no copy for F order
+        delta_sq = np.vdot(v_01_flat, v_01_flat).real
+
+    return v_00
+
+
+def _sancho_rubio_batch(v_00, v_11, v_01, v_10, conv):
+    """Stacked version of _sancho_rubio for (nenergies, n, n) arrays.
+
+    Energies drop out of the iteration as soon as they converge.  v_00 is
+    updated in place and returned."""
+    n = v_00.shape[-1]
+    conv_sq = conv**2
+    result = v_00
+    todo = np.arange(len(v_00))
+    while len(todo):
+        ab = np.linalg.solve(v_11, np.concatenate([v_01, v_10], axis=-1))
+        a = ab[..., :n]
+        b = ab[..., n:]
+        v_01_dot_b = v_01 @ b
+        v_00 -= v_01_dot_b
+        v_11 -= v_10 @ a
+        v_11 -= v_01_dot_b
+        v_01 = -v_01 @ a
+        v_10 = -v_10 @ b
+        delta_sq = np.einsum('eij,eij->e', v_01.conj(), v_01).real
+        done = ~(delta_sq > conv_sq)  # stop like _sancho_rubio on NaN
+        if done.any():
+            result[todo[done]] = v_00[done]
+            left = ~done
+            todo = todo[left]
+            v_00, v_11, v_01, v_10 = (v_00[left], v_11[left],
+                                      v_01[left], v_10[left])
+
+    return result
 
 
 class LeadSelfEnergy:
     conv = 1e-8  # Convergence criteria for surface Green function
+    # Number of self-energies kept by retarded().  A transport calculation
+    # visits each energy once and only re-requests the current one, so
+    # the default is small; raise it to reuse a whole energy grid.
+    cachesize = 2
     
     def __init__(self, hs_dii, hs_dij, hs_dim, eta=1e-4):
         self.h_ii, self.s_ii = hs_dii  # onsite principal layer
         self.h_ij, self.s_ij = hs_dij  # coupling between principal layers
         self.h_im, self.s_im = hs_dim  # coupling to the central region
+        # The lead matrices are fixed, so conjugate them once.  h_im and
+        # s_im are left alone since the calculator rotates them in place.
+        self.h_ii_d = np.ascontiguousarray(dagger(self.h_ii))
+        self.s_ii_d = np.ascontiguousarray(dagger(self.s_ii))
+        self.h_ij_d = np.ascontiguousarray(dagger(self.h_ij))
+        self.s_ij_d = np.ascontiguousarray(dagger(self.s_ij))
+        # One block holding all matrices of the Sancho-Rubio iteration
+        nbf_lead = self.h_ii.shape[0]
+        self._sgf_work = np.empty((nbf_lead, 8 * nbf_lead), complex,
+                                  order='F')
         self.nbf = self.h_im.shape[1]  # nbf for the scattering region
+        # Work arrays for the lead-region couplings in retarded()
+        self._tau_im = np.empty(self.h_im.shape, complex, order='F')
+        self._tau_mi = np.empty(self.h_im.shape[::-1], complex)
+        self.gamma_mm = np.empty((self.nbf, self.nbf), complex)
         self.eta = eta
-        self.energy = None
         self.bias = 0
-        self.sigma_mm = np.empty((self.nbf, self.nbf), complex)
+        self.cache = OrderedDict()  # (energy, bias) -> sigma_mm
     
     def retarded(self, energy):
-        """Return self-energy (sigma) evaluated at specified energy."""
-        if energy != self.energy:
-            self.energy = energy
-            z = energy - self.bias + self.eta * 1.j           
-            tau_im = z * self.s_im - self.h_im
-            a_im = np.linalg.solve(self.get_sgfinv(energy), tau_im)
-            tau_mi = z * self.s_im.T.conj() - self.h_im.T.conj()
-            self.sigma_mm[:] = np.dot(tau_mi, a_im)
+        """Return self-energy (sigma) evaluated at specified energy.
+
+        The most recent results are cached, so the returned array is
+        shared and must not be modified by the caller."""
+        key = (energy, self.bias)
+        sigma_mm = self.cache.get(key)
+        if sigma_mm is not None:
+            self.cache.move_to_end(key)
+            return sigma_mm
+
+        z = energy - self.bias + self.eta * 1.j
+        tau_im = self._tau_im
+        tau_mi = self._tau_mi
+        # tau_mi = z s_mi - h_mi is the conjugate of z^* s_im - h_im
+        np.multiply(z.conjugate(), self.s_im, out=tau_im)
+        tau_im -= self.h_im
+        np.conjugate(tau_im.T, out=tau_mi)
+        np.multiply(z, self.s_im, out=tau_im)
+        tau_im -= self.h_im
+        lu_piv = lu_factor(self.get_sgfinv(energy), overwrite_a=True,
+                          check_finite=False)
+        a_im = lu_solve(lu_piv, tau_im, overwrite_b=True, check_finite=False)
+        sigma_mm = np.dot(tau_mi, a_im)
 
-        return self.sigma_mm
+        self._store(key, sigma_mm)
+        return sigma_mm
+
+    def precompute_energies(self, energies):
+        """Calculate and cache the self-energy on a grid of energies.
+
+        The surface Green functions for all energies are iterated together
+        as stacked matrices, which avoids the per-energy Python overhead
+        of retarded() for small leads.  The cache is enlarged to hold
+        the whole grid."""
+        energies = list(energies)
+        self.cachesize = max(self.cachesize, len(energies))
+        energies = [energy for energy in energies
+                    if (energy, self.bias) not in self.cache]
+        if not energies:
+            return
+
+        z_e = np.asarray(energies) - self.bias + self.eta * 1.j
+        z_e = z_e[:, None, None]
+        v_00, v_10, v_01 = np.empty((3, len(energies)) + self.h_ii.shape,
+                                    complex)
+        self._build_v(z_e, v_00, v_10, v_01)
+        sgfinv_eii = _sancho_rubio_batch(v_00, v_00.copy(), v_01, v_10,
+                                         self.conv)
+
+        tau_eim = z_e * self.s_im - self.h_im
+        a_eim = np.linalg.solve(sgfinv_eii, tau_eim)
+        tau_emi = z_e * self.s_im.T.conj() - self.h_im.T.conj()
+        sigma_emm = tau_emi @ a_eim
+        for energy, sigma_mm in zip(energies, sigma_emm):
+            self._store((energy, self.bias), sigma_mm)
+
+    def _store(self, key, sigma_mm):
+        self.cache[key] = sigma_mm
+        if len(self.cache) > self.cachesize:
+            self.cache.popitem(last=False)
 
     def set_bias(self, bias):
         self.bias = bias
+        self.cache.clear()
+
+    def clear_cache(self):
+        """Forget cached self-energies.
+
+        Must be called after h_im or s_im are modified in place."""
+        self.cache.clear()
 
     def get_lambda(self, energy):
         """Return the lambda (aka Gamma) defined by i(S-S^d).
 
         Here S is the retarded selfenergy, and d denotes the hermitian
-        conjugate.
+        conjugate.  The result is written to self.gamma_mm, which is
+        overwritten by the next call.
         """
         sigma_mm = self.retarded(energy)
-        return 1.j * (sigma_mm - sigma_mm.T.conj())
+        gamma_mm = self.gamma_mm
+        np.conjugate(sigma_mm.T, out=gamma_mm)
+        np.subtract(sigma_mm, gamma_mm, out=gamma_mm)
+        gamma_mm *= 1.j
+        return gamma_mm
         
     def get_sgfinv(self, energy):
-        """The inverse of the retarded surface Green function""" 
+        """The inverse of the retarded surface Green function.
+
+        The result lives in a work array which is overwritten by the
+        next call."""
         z = energy - self.bias + self.eta * 1.j
-        
-        v_00 = z * self.s_ii.T.conj() - self.h_ii.T.conj()
-        v_11 = v_00.copy()
-        v_10 = z * self.s_ij - self.h_ij
-        v_01 = z * self.s_ij.T.conj() - self.h_ij.T.conj()
-
-        delta = self.conv + 1
-        while delta > self.conv:
-            a = np.linalg.solve(v_11, v_01)
-            b = np.linalg.solve(v_11, v_10)
-            v_01_dot_b = np.dot(v_01, b)
-            v_00 -= v_01_dot_b
-            v_11 -= np.dot(v_10, a) 
-            v_11 -= v_01_dot_b
-            v_01 = -np.dot(v_01, a)
-            v_10 = -np.dot(v_10, b)
-            delta = abs(v_01).max()
-
-        return v_00
+
+        # LAPACK and BLAS work in Fortran order; the column blocks of the
+        # work array are Fortran-contiguous, so all updates are in place
+        work = self._sgf_work
+        n = len(work)
+        v_00, v_11, v_01, v_10 = [work[:, i * n:(i + 1) * n]
+                                  for i in range(4)]
+        self._build_v(z, v_00, v_10, v_01)
+        v_11[:] = v_00
+
+        return _sancho_rubio(work, self.conv)
+
+    def _build_v(self, z, v_00, v_10, v_01):
+        """Write the initial v_00, v_10 and v_01 of the decimation.
+
+        z is a scalar for (n, n) outputs, or has shape (nenergies, 1, 1)
+        for stacked (nenergies, n, n) outputs."""
+        np.multiply(z, self.s_ii_d, out=v_00)
+        v_00 -= self.h_ii_d
+        np.multiply(z, self.s_ij, out=v_10)
+        v_10 -= self.h_ij
+        np.multiply(z, self.s_ij_d, out=v_01)
+        v_01 -= self.h_ij_d
 
 
 class BoxProbe:
@@ -23,16 +23,15 @@ def normalize(matrix, S=None):
       <matrix[:,i]| S |matrix[:,i]> = 1
 
     """
-    for col in matrix.T:
-        if S is None:
-            col /= np.linalg.norm(col)
-        else:
-            col /= np.sqrt(np.dot(col.conj(), np.dot(S, col)))
+    if S is None:
+        matrix /= np.linalg.norm(matrix, axis=0)
+    else:
+        matrix /= np.sqrt(np.einsum('ij,ij->j', matrix.conj(),
+                                    np.dot(S, matrix)))
 
 
 def subdiagonalize(h_ii, s_ii, index_j):
     nb = h_ii.shape[0]
-    nb_sub = len(index_j)
     h_sub_jj = get_subspace(h_ii, index_j)
     s_sub_jj = get_subspace(s_ii, index_j)
     e_j, v_jj = np.linalg.eig(np.linalg.solve(s_sub_jj, h_sub_jj))
@@ -43,9 +42,7 @@ def subdiagonalize(h_ii, s_ii, index_j):
 
     # Setup transformation matrix
     c_ii = np.identity(nb, complex)
-    for i in range(nb_sub):
-        for j in range(nb_sub):
-            c_ii[index_j[i], index_j[j]] = v_jj[i, j]
+    c_ii[np.ix_(index_j, index_j)] = v_jj
 
     h1_ii = rotate_matrix(h_ii, c_ii)
     s1_ii = rotate_matrix(s_ii, c_ii)
@@ -54,14 +51,13 @@ def subdiagonalize(h_ii, s_ii, index_j):
 
 
 def cutcoupling(h, s, index_n):
-    for i in index_n:
-        s[:, i] = 0.0
-        s[i, :] = 0.0
-        s[i, i] = 1.0
-        Ei = h[i, i]
-        h[:, i] = 0.0
-        h[i, :] = 0.0
-        h[i, i] = Ei
+    index_n = np.asarray(index_n, int)
+    e_n = h[index_n, index_n]
+    for matrix in (h, s):
+        matrix[:, index_n] = 0.0
+        matrix[index_n, :] = 0.0
+    s[index_n, index_n] = 1.0
+    h[index_n, index_n] = e_n
 
 
 def fermidistribution(energy, kt):
@@ -70,7 +66,7 @@ def fermidistribution(energy, kt):
     assert kt >= 0., 'Negative temperature encountered!'
 
     if kt == 0:
-        if isinstance(energy, float):
+        if np.ndim(energy) == 0:
             return int(energy / 2. <= 0)
         else:
             return (energy / 2. <= 0).astype(int)